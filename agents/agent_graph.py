@@ -1,39 +1,48 @@
 # agents/agent_graph.py
 import sys
 import json
+import asyncio
 from repo_fetcher_agent import repo_fetcher_agent
 from structure_analyzer_agent import structure_analyzer_agent
 from flow_reasoning_agent import flow_reasoning_agent
 
-def run_agent_graph(text: str) -> dict:
+_FALLBACK_RESULT = {
+    "key_components": ("core system", "input handler", "output formatter"),
+    "key_functions": ("main", "init", "process"),
+    "execution_flow": (
+        "System initializes core components",
+        "Input handler receives and validates data",
+        "Main processor transforms the data",
+        "Output formatter prepares response",
+        "System returns formatted result"
+    )
+}
+
+async def run_agent_graph_async(text: str) -> dict:
     try:
-        import asyncio
-
-        async def execute_pipeline():
-            chunk_result = await repo_fetcher_agent.process(text)
+        chunk_result = await repo_fetcher_agent.process(text)
 
-            structure_result = await structure_analyzer_agent.process(chunk_result["chunks"])
+        structure_result = await structure_analyzer_agent.process(chunk_result["chunks"])
 
-            flow_result = await flow_reasoning_agent.process(structure_result["dependency_graph"])
+        flow_result = await flow_reasoning_agent.process(structure_result["dependency_graph"])
 
-            return flow_result
+        return flow_result
 
-        result = asyncio.run(execute_pipeline())
+    except Exception as e:
+        return _fallback_result()
 
-        return result
+def _fallback_result() -> dict:
+    return {key: list(value) for key, value in _FALLBACK_RESULT.items()}
 
+def run_agent_graph(text: str) -> dict:
+    # asyncio.run refuses to start inside a running loop; fall back as the
+    # pipeline itself does rather than raising.
+    pipeline = run_agent_graph_async(text)
+    try:
+        return asyncio.run(pipeline)
     except Exception as e:
-        return {
-            "key_components": ["core system", "input handler", "output formatter"],
-            "key_functions": ["main", "init", "process"],
-            "execution_flow": [
-                "System initializes core components",
-                "Input handler receives and validates data",
-                "Main processor transforms the data",
-                "Output formatter prepares response",
-                "System returns formatted result"
-            ]
-        }
+        pipeline.close()
+        return _fallback_result()
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
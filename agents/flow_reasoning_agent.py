@@ -1,7 +1,10 @@
 # agents/flow_reasoning_agent.py
 from uagents import Agent, Context, Model
 from typing import List, Dict
-import networkx as nx
+from collections import Counter, defaultdict, deque
+import re
+
+_FUNCTION_KEYWORDS = re.compile(r"handler|process|create|update|delete|fetch|get|post|put", re.IGNORECASE)
 
 class FlowRequest(Model):
     dependency_graph: Dict
@@ -15,20 +18,44 @@ class FlowReasoningAgent(Agent):
     def __init__(self):
         super().__init__(name="flow_reasoner", seed="flow_reasoner_seed")
 
-    def build_execution_flow(self, graph_data: Dict) -> List[str]:
+    def build_graph(self, graph_data: Dict) -> Dict:
         nodes = graph_data.get("nodes", [])
         edges = graph_data.get("edges", [])
 
+        adjacency = defaultdict(list)
+        in_degree = Counter(dict.fromkeys(nodes, 0))
+        for source, target in edges:
+            adjacency[source].append(target)
+            in_degree.setdefault(source, 0)
+            in_degree[target] += 1
+
+        return {
+            "nodes": nodes,
+            "adjacency": adjacency,
+            "in_degree": in_degree
+        }
+
+    def build_execution_flow(self, graph: Dict) -> List[str]:
+        nodes = graph["nodes"]
+
         if not nodes:
             return ["System initializes", "Processes input", "Returns output"]
 
-        G = nx.DiGraph()
-        G.add_nodes_from(nodes)
-        G.add_edges_from(edges)
-
-        try:
-            topological_order = list(nx.topological_sort(G))
-        except nx.NetworkXError:
+        adjacency = graph["adjacency"]
+        in_degree = Counter(graph["in_degree"])
+
+        # Kahn's algorithm; a cycle leaves nodes unvisited.
+        queue = deque(node for node, degree in in_degree.items() if degree == 0)
+        topological_order = []
+        while queue:
+            node = queue.popleft()
+            topological_order.append(node)
+            for target in adjacency.get(node, ()):
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+
+        if len(topological_order) < len(in_degree):
             topological_order = nodes[:10]
 
         flow_steps = []
@@ -42,34 +69,27 @@ class FlowReasoningAgent(Agent):
 
         return flow_steps
 
-    def extract_key_components(self, graph_data: Dict) -> List[str]:
-        nodes = graph_data.get("nodes", [])
-        edges = graph_data.get("edges", [])
-
-        if not nodes:
+    def extract_key_components(self, graph: Dict) -> List[str]:
+        if not graph["nodes"]:
             return ["core system", "input handler", "output formatter"]
 
-        G = nx.DiGraph()
-        G.add_nodes_from(nodes)
-        G.add_edges_from(edges)
-
-        centrality = nx.degree_centrality(G)
-        sorted_nodes = sorted(centrality.items(), key=lambda x: x[1], reverse=True)
+        adjacency = graph["adjacency"]
+        degree = Counter({node: count + len(adjacency.get(node, ())) for node, count in graph["in_degree"].items()})
 
-        return [node for node, _ in sorted_nodes[:5]]
+        return [node for node, _ in degree.most_common(5)]
 
-    def extract_key_functions(self, graph_data: Dict) -> List[str]:
-        nodes = graph_data.get("nodes", [])
+    def extract_key_functions(self, graph: Dict) -> List[str]:
+        nodes = graph["nodes"]
 
-        function_keywords = ['handler', 'process', 'create', 'update', 'delete', 'fetch', 'get', 'post', 'put']
-        functions = [node for node in nodes if any(kw in node.lower() for kw in function_keywords)]
+        functions = [node for node in nodes if _FUNCTION_KEYWORDS.search(node)]
 
         return functions[:5] if functions else nodes[:5] if nodes else ["main", "init", "run"]
 
     async def process(self, dependency_graph: Dict) -> Dict:
-        execution_flow = self.build_execution_flow(dependency_graph)
-        key_components = self.extract_key_components(dependency_graph)
-        key_functions = self.extract_key_functions(dependency_graph)
+        graph = self.build_graph(dependency_graph)
+        execution_flow = self.build_execution_flow(graph)
+        key_components = self.extract_key_components(graph)
+        key_functions = self.extract_key_functions(graph)
 
         return {
             "execution_flow": execution_flow,
@@ -1,9 +1,23 @@
 # agents/repo_fetcher_agent.py
 from uagents import Agent, Context, Model
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import hashlib
 import numpy as np
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+EMBEDDING_DIM = 128
+
+# Embeddings are chunk fingerprints, not cryptographic hashes, so the fast
+# non-cryptographic XXH3 is preferred. Both hashes produce shorter digests
+# than the embedding, which is the concatenation of digests under distinct
+# seeds (XXH3) or salts (BLAKE2b).
+_EMBEDDING_SEEDS = range(EMBEDDING_DIM // 16)
+_EMBEDDING_SALTS = tuple(bytes([i]) for i in range(EMBEDDING_DIM // hashlib.blake2b.MAX_DIGEST_SIZE))
+
 class ChunkRequest(Model):
     text: str
 
@@ -15,34 +29,42 @@ class RepoFetcherAgent(Agent):
     def __init__(self):
         super().__init__(name="repo_fetcher", seed="repo_fetcher_seed")
 
-    def chunk_text(self, text: str, chunk_size: int = 1000) -> List[str]:
-        words = text.split()
-        chunks = []
+    def chunk_text(self, text: str, chunk_size: int = 1000) -> Iterator[str]:
         current_chunk = []
         current_size = 0
 
-        for word in words:
+        for word in text.split():
             current_chunk.append(word)
             current_size += len(word) + 1
             if current_size >= chunk_size:
-                chunks.append(" ".join(current_chunk))
+                yield " ".join(current_chunk)
                 current_chunk = []
                 current_size = 0
 
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
+            yield " ".join(current_chunk)
 
-        return chunks
-
-    def simple_embedding(self, text: str) -> List[float]:
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
-        embedding = [float(b) / 255.0 for b in hash_bytes[:128]]
-        return embedding
+    def simple_embedding(self, text: str) -> np.ndarray:
+        data = text.encode()
+        if xxhash is not None:
+            digest = b"".join(xxhash.xxh3_128_digest(data, seed=seed) for seed in _EMBEDDING_SEEDS)
+        else:
+            digest = b"".join(
+                hashlib.blake2b(data, digest_size=hashlib.blake2b.MAX_DIGEST_SIZE, salt=salt).digest()
+                for salt in _EMBEDDING_SALTS
+            )
+        return np.frombuffer(digest, dtype=np.uint8).astype(np.float32) * (1.0 / 255.0)
 
     async def process(self, text: str) -> Dict:
-        chunks = self.chunk_text(text)
-        embeddings = [self.simple_embedding(chunk) for chunk in chunks]
+        chunks = []
+        vectors = []
+        for chunk in self.chunk_text(text):
+            chunks.append(chunk)
+            vectors.append(self.simple_embedding(chunk))
+
+        # Vectors are stacked into one array and converted once, so the result
+        # matches ChunkResponse and stays JSON-serializable.
+        embeddings = np.stack(vectors).tolist() if vectors else []
 
         return {
             "chunks": chunks,
@@ -1,9 +1,41 @@
 # agents/structure_analyzer_agent.py
 from uagents import Agent, Context, Model
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, FrozenSet, Tuple
+from itertools import combinations
+import heapq
+import sys
 import re
 import networkx as nx
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Only the most frequently mentioned entities in a chunk are paired, which
+# bounds each chunk's contribution to the graph at K*(K-1)/2 edges.
+_MAX_ENTITIES_PER_CHUNK = 10
+
+_ENTITY_PATTERNS = [
+    r'\bclass\s+(\w+)',
+    r'\bfunction\s+(\w+)',
+    r'\bdef\s+(\w+)',
+    r'\bconst\s+(\w+)',
+    r'\blet\s+(\w+)',
+    r'\bvar\s+(\w+)',
+    r'\binterface\s+(\w+)',
+    r'\btype\s+(\w+)',
+    r'\bcomponent\s+(\w+)',
+    r'\bAPI\s+(\w+)',
+    r'\bendpoint\s+(\w+)',
+    r'\bservice\s+(\w+)',
+    r'\bmodule\s+(\w+)',
+]
+
+# Every pattern captures exactly one group, so a single alternation scans each
+# chunk once and the matching branch is the only non-empty group.
+_ENTITY_UNION = re.compile("|".join(f"(?:{pattern})" for pattern in _ENTITY_PATTERNS), re.IGNORECASE)
+
 class StructureRequest(Model):
     chunks: List[str]
 
@@ -14,59 +46,95 @@ class StructureAnalyzerAgent(Agent):
     def __init__(self):
         super().__init__(name="structure_analyzer", seed="structure_analyzer_seed")
 
+    def scan_entities(self, chunk: str) -> Set[str]:
+        return {sys.intern(next(filter(None, match.groups()))) for match in _ENTITY_UNION.finditer(chunk)}
+
     def extract_entities(self, chunks: List[str]) -> Set[str]:
         entities = set()
-        patterns = [
-            r'\bclass\s+(\w+)',
-            r'\bfunction\s+(\w+)',
-            r'\bdef\s+(\w+)',
-            r'\bconst\s+(\w+)',
-            r'\blet\s+(\w+)',
-            r'\bvar\s+(\w+)',
-            r'\binterface\s+(\w+)',
-            r'\btype\s+(\w+)',
-            r'\bcomponent\s+(\w+)',
-            r'\bAPI\s+(\w+)',
-            r'\bendpoint\s+(\w+)',
-            r'\bservice\s+(\w+)',
-            r'\bmodule\s+(\w+)',
-        ]
-
         for chunk in chunks:
-            for pattern in patterns:
-                matches = re.findall(pattern, chunk, re.IGNORECASE)
-                entities.update(matches)
+            entities.update(self.scan_entities(chunk))
 
         return entities
 
-    def find_dependencies(self, chunks: List[str], entities: Set[str]) -> List[Tuple[str, str]]:
+    def build_entity_automaton(self, entities: FrozenSet[str]):
+        # Entities that differ only in case share a lowercase key, so each key
+        # maps to every original spelling.
+        automaton = ahocorasick.Automaton()
+        for entity in entities:
+            key = entity.lower()
+            automaton.add_word(key, automaton.get(key, ()) + (entity,))
+        automaton.make_automaton()
+        return automaton
+
+    def count_mentions(self, chunk_lower: str, entity_lower: str) -> Tuple[int, int]:
+        # Overlapping occurrences and the end index of the first one, matching
+        # what the automaton reports.
+        count = 0
+        first_end = -1
+        position = chunk_lower.find(entity_lower)
+        while position >= 0:
+            if count == 0:
+                first_end = position + len(entity_lower) - 1
+            count += 1
+            position = chunk_lower.find(entity_lower, position + 1)
+        return count, first_end
+
+    def find_dependencies(self, chunks: List[str], entities: FrozenSet[str]) -> List[Tuple[str, str]]:
         dependencies = []
+        seen_pairs = set()
+
+        if not entities:
+            return dependencies
+
+        if ahocorasick is not None:
+            automaton = self.build_entity_automaton(entities)
+        else:
+            automaton = None
+            lower_entities = [(e, e.lower()) for e in entities]
 
         for chunk in chunks:
             chunk_lower = chunk.lower()
-            found_entities = [e for e in entities if e.lower() in chunk_lower]
+            mentions = {}
+            if automaton is not None:
+                for end, matched in automaton.iter(chunk_lower):
+                    for e in matched:
+                        if e in mentions:
+                            mentions[e] = (mentions[e][0] + 1, mentions[e][1])
+                        else:
+                            mentions[e] = (1, end)
+            else:
+                for e, entity_lower in lower_entities:
+                    count, first_end = self.count_mentions(chunk_lower, entity_lower)
+                    if count:
+                        mentions[e] = (count, first_end)
+
+            # Most mentioned first; ties go to the earliest mention, then the name,
+            # so the selection does not depend on set iteration order.
+            top_entities = heapq.nsmallest(
+                _MAX_ENTITIES_PER_CHUNK, mentions,
+                key=lambda e: (-mentions[e][0], mentions[e][1], e)
+            )
 
-            for i, entity1 in enumerate(found_entities):
-                for entity2 in found_entities[i+1:]:
-                    if entity1 != entity2:
-                        dependencies.append((entity1, entity2))
+            for entity1, entity2 in combinations(top_entities, 2):
+                key = (entity1, entity2) if entity1 < entity2 else (entity2, entity1)
+                if key in seen_pairs:
+                    continue
+                seen_pairs.add(key)
+                dependencies.append((entity1, entity2))
 
         return dependencies
 
     async def process(self, chunks: List[str]) -> Dict:
-        entities = self.extract_entities(chunks)
+        entities = frozenset(self.extract_entities(chunks))
         dependencies = self.find_dependencies(chunks, entities)
 
         G = nx.DiGraph()
-        for entity in entities:
-            G.add_node(entity)
-        for source, target in dependencies:
-            G.add_edge(source, target)
+        G.add_edges_from(dependencies)
+        G.add_nodes_from(entities.difference(G))
 
         graph_data = {
             "nodes": list(G.nodes()),
-            "edges": [(u, v) for u, v in G.edges()],
-            "components": list(nx.weakly_connected_components(G)) if G.nodes() else []
+            "edges": list(G.edges())
         }
 
         return {